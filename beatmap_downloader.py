@@ -2,14 +2,20 @@ from datetime import datetime
 from typing import Any, List
 from rich.progress import Progress, BarColumn, DownloadColumn, TransferSpeedColumn
 from rich.console import Console
-from rich import print
-from pydantic import BaseModel
+from aiolimiter import AsyncLimiter
+import msgspec
+import aiofiles
 import httpx
 import asyncio
+import getpass
+import os
+import random
+import re
 import sys
+import time
 
 
-class Beatmap(BaseModel):
+class Beatmap(msgspec.Struct):
     difficulty_ar: float
     difficulty_hp: float
     source: str
@@ -38,22 +44,40 @@ class Beatmap(BaseModel):
     ignored: Any
 
 
-class QueryMaps(BaseModel):
+class QueryMaps(msgspec.Struct):
     result_count: int
     beatmaps: List[Beatmap] = []
 
 downloaded_count = 0
 console = Console()
-query_url = "https://osusearch.com/query/?statuses=Unranked&modes=Standard&min_length=90&star=(5.00,10.00)&premium_mappers=true&offset={}"
-cookies: httpx.Cookies = None
-
-def query_maps(offset=0):
-    response = httpx.get(query_url.format(offset), timeout=httpx.Timeout(10.0))
-    return QueryMaps(**response.json())
-
-
-def login(username, password):
-    osu_home = httpx.get("https://osu.ppy.sh/home")
+query_base = "https://osusearch.com/query/"
+query_params = {
+    "statuses": "Unranked",
+    "modes": "Standard",
+    "min_length": 90,
+    "star": "(5.00,10.00)",
+    "premium_mappers": "true"
+}
+concurrency = 6
+sem = asyncio.Semaphore(concurrency)
+limiter = AsyncLimiter(max_rate=8, time_period=60)
+max_retries = 5
+http_client = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        retries=3,
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    ),
+    timeout=httpx.Timeout(10.0)
+)
+
+async def query_maps(offset=0):
+    response = await http_client.get(query_base, params={**query_params, "offset": offset})
+    return msgspec.json.decode(response.content, type=QueryMaps)
+
+
+async def login(username, password):
+    osu_home = await http_client.get("https://osu.ppy.sh/home")
     _token = osu_home.cookies.get("XSRF-TOKEN")
     payload = dict(
         _token=_token,
@@ -63,71 +87,99 @@ def login(username, password):
     headers = httpx.Headers()
     headers["origin"] = 'https://osu.ppy.sh'
     headers["referer"] = 'https://osu.ppy.sh/home'
-    session = httpx.post("https://osu.ppy.sh/session", data=payload, cookies=osu_home.cookies, headers=headers)
+    session = await http_client.post("https://osu.ppy.sh/session", data=payload, headers=headers)
     if session.is_error:
-        print("登入失敗!")
+        console.print("登入失敗!")
         exit()
 
-    global cookies
-    cookies = session.cookies
+    http_client.cookies.update(session.cookies)
     user_data = session.json()
-    print(f"登入成功! {user_data['user']['username']}#{user_data['user']['id']}")
+    console.print(f"登入成功! {user_data['user']['username']}#{user_data['user']['id']}")
+
+_invalid_re = re.compile(r'[<>:"/\\|?*]')
+_filename_re = re.compile(r'filename="([^"]+)"')
 
 def fixedfilename(filename: str):
-    return filename.replace('<', '_') \
-        .replace('>', '_') \
-        .replace('/', '_') \
-        .replace('\\', '_') \
-        .replace(':', '_') \
-        .replace('*', '_') \
-        .replace('?', '_') \
-        .replace('"', '_') \
-        .replace('|', '_')
+    return _invalid_re.sub('_', filename)
 
 async def download_map(client: httpx.AsyncClient, progress: Progress, save_path: str, setid):
-    global cookies, downloaded_count
+    global downloaded_count
     headers = httpx.Headers()
     headers['Referer'] = 'https://osu.ppy.sh/'
-    async with client.stream('GET', f"https://osu.ppy.sh/beatmapsets/{setid}/download", cookies=cookies, headers=headers, follow_redirects=True) as response:
-        if response.status_code == 429:
-            console.print("[red]429 Too Many Requests")
-            raise Exception("429 Too Many Requests")
-        elif response.status_code == 404:
-            return
-
-        total = int(response.headers["Content-Length"])
-        filename = response.headers["Content-Disposition"].removeprefix("attachment;filename=\"").removesuffix("\";")
-        filename = fixedfilename(filename)
-        file = open(save_path+filename, 'wb')
-        download_task = progress.add_task(filename, total=total)
-        async for chunk in response.aiter_bytes():
-            file.write(chunk)
-            progress.update(download_task, completed=response.num_bytes_downloaded)
-        file.close()
-        progress.update(download_task, visible=False)
-        progress.log(filename+" 下載完成!")
-        downloaded_count += 1
-
-
-def logout():
-    global cookies
+    async with sem:
+        for attempt in range(max_retries):
+            failure = None
+            download_task = None
+            async with limiter:
+                try:
+                    async with client.stream('GET', f"https://osu.ppy.sh/beatmapsets/{setid}/download", headers=headers, follow_redirects=True) as response:
+                        if response.status_code == 429 or response.status_code >= 500:
+                            failure = f"HTTP {response.status_code}"
+                        elif response.status_code == 404:
+                            return
+                        else:
+                            total = int(response.headers["Content-Length"])
+                            matched = _filename_re.search(response.headers["Content-Disposition"])
+                            if not matched:
+                                console.print(f"[red]{setid} 無法解析檔名: {response.headers['Content-Disposition']!r}")
+                                return
+                            filename = fixedfilename(matched.group(1))
+                            # 先寫到 .part，下載完成才改名，中斷的檔才不會被當成已下載
+                            tmp_path = save_path+filename+".part"
+                            download_task = progress.add_task(filename, total=total)
+                            last_update = 0.0
+                            last_bytes = 0
+                            async with aiofiles.open(tmp_path, 'wb', buffering=1024*1024) as file:
+                                if total and hasattr(os, 'posix_fallocate'):
+                                    os.posix_fallocate(file.fileno(), 0, total)
+                                async for chunk in response.aiter_bytes():
+                                    await file.write(chunk)
+                                    downloaded = response.num_bytes_downloaded
+                                    now = time.monotonic()
+                                    if now - last_update > 0.1 or downloaded - last_bytes > 262144:
+                                        progress.update(download_task, completed=downloaded)
+                                        last_update = now
+                                        last_bytes = downloaded
+                            os.replace(tmp_path, save_path+filename)
+                            progress.update(download_task, completed=total, visible=False)
+                            progress.log(filename+" 下載完成!")
+                            downloaded_count += 1
+                            return
+                except httpx.TransportError as error:
+                    failure = repr(error)
+                    if download_task is not None:
+                        progress.remove_task(download_task)
+            delay = min(60, 2 ** attempt + random.random())
+            console.print(f"[yellow]{failure}, {delay:.1f}秒後重試 {setid}")
+            await asyncio.sleep(delay)
+        console.print(f"[red]{setid} 重試 {max_retries} 次仍然失敗，跳過這張圖")
+
+
+async def logout():
     headers = httpx.Headers()
     headers['Referer'] = 'https://osu.ppy.sh/'
-    httpx.delete("https://osu.ppy.sh/session")
+    await http_client.delete("https://osu.ppy.sh/session", headers=headers)
 
 async def main(offset=0, *args):
-    http_client = httpx.AsyncClient()
     running = True
-    batch = 3
 
     if offset:
         console.print(f"{offset=}")
         offset = int(offset)
 
-    username = input("Username: ")
-    password = input("Password: ")
-    path = input("請輸入存放位置: (預設為./)") or "./"
-    login(username, password)
+    loop = asyncio.get_running_loop()
+    username = await loop.run_in_executor(None, input, "Username: ")
+    password = await loop.run_in_executor(None, getpass.getpass, "Password: ")
+    path = await loop.run_in_executor(None, input, "請輸入存放位置: (預設為./)") or "./"
+    # osu! 的檔名以 setid 開頭，掃一次資料夾就能跳過已下載的圖
+    existing = {
+        int(name.split(maxsplit=1)[0])
+        for name in os.listdir(path)
+        if name.endswith('.osz') and name.split(maxsplit=1)[0].isdigit()
+    }
+    if existing:
+        console.print(f"已存在 {len(existing)} 張圖，將跳過這些圖譜")
+    await login(username, password)
 
     with Progress(
         "[progress.percentage]{task.description}",
@@ -138,27 +190,29 @@ async def main(offset=0, *args):
         progress.log("開始進行下載程式...")
 
         try:
+            progress.log("正在獲取圖譜資訊...")
+            maps_data = await query_maps(offset)
             while running:
-                progress.log("正在獲取圖譜資訊...")
-                maps_data = query_maps(offset)
                 if maps_data.result_count > 0:
                     progress.log(f"總計找到 {maps_data.result_count} 張圖譜")
 
-                for r in range(0, len(maps_data.beatmaps), batch):
-                    await asyncio.gather(
-                        *[download_map(http_client, progress, path, map.beatmapset_id) for map in maps_data.beatmaps[r:r+batch]]
-                    )
+                next_page_task = asyncio.create_task(query_maps(offset + 1))
+                await asyncio.gather(
+                    *[download_map(http_client, progress, path, map.beatmapset_id) for map in maps_data.beatmaps if map.beatmapset_id not in existing]
+                )
 
                 if len(maps_data.beatmaps):
                     offset += 1
+                    maps_data = await next_page_task
                 else:
+                    next_page_task.cancel()
                     console.log("已經沒有圖了!")
                     running = False
         except KeyboardInterrupt:
+            console.print("登出中...")
+            await logout()
             console.print("等待http_client停止")
             await http_client.aclose()
-            console.print("登出中...")
-            console.logout()
         finally:
             return offset
 
@@ -169,8 +223,8 @@ if __name__ == "__main__":
         offset = loop.run_until_complete(main(*sys.argv[1:]))
     except Exception as e:
         console.print_exception(show_locals=True)
-        if cookies:
+        if http_client.cookies:
             console.print("登出中...")
-            logout()
+            loop.run_until_complete(logout())
     console.print(f"程式已結束，總計下載 {downloaded_count} 張圖。")
     console.print(f"{offset=}")
\ No newline at end of file